@@ -20,15 +20,20 @@ class DocumentProcessor:
     def process_pdf(self, content: bytes, filename: str) -> DocumentInfo:
         """Process PDF and extract text"""
         try:
-            pdf_reader = PdfReader(io.BytesIO(content))
-            text = "".join([page.extract_text() for page in pdf_reader.pages])
-            
             doc_id = hashlib.md5(content).hexdigest()[:8]
+            cached = self.documents.get(doc_id)
+            if cached is not None:
+                # Same content: reuse the extracted text, record this upload
+                text, pages = cached.text, cached.pages
+            else:
+                pdf_reader = PdfReader(io.BytesIO(content))
+                text = "".join([page.extract_text() for page in pdf_reader.pages])
+                pages = len(pdf_reader.pages)
             
             doc_info = DocumentInfo(
                 filename=filename,
                 text=text,
-                pages=len(pdf_reader.pages),
+                pages=pages,
                 uploaded_at=datetime.now().isoformat(),
                 doc_id=doc_id
             )
@@ -20,7 +20,11 @@ Architecture:
 import os
 import hashlib
 import io
-from typing import Dict, Any, Optional
+import logging
+import re
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Any, Optional
 from datetime import datetime
 
 # FastAPI framework
@@ -39,6 +43,9 @@ from dotenv import load_dotenv
 # === CONFIGURATION ===
 load_dotenv()  # Load environment variables
 
+# Module logger; per-query debug output is only emitted at DEBUG level
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Enterprise Production Assistant",
@@ -57,7 +64,8 @@ app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
 documents: Dict[str, Dict] = {}
 
 # Conversation memory for follow-up questions
-conversation_history: Dict[str, list] = {}  # session_id -> [conversation]
+MAX_EXCHANGES_PER_SESSION = 10
+conversation_history: Dict[str, Deque[dict]] = {}  # session_id -> bounded [conversation]
 
 # Content moderation keywords
 HARMFUL_KEYWORDS = [
@@ -70,6 +78,12 @@ PROFANITY_FILTER = [
     'spam', 'scam', 'fraud'
 ]
 
+# Single-pass matcher for all moderated keywords
+MODERATION_PATTERN = re.compile('|'.join(re.escape(k) for k in HARMFUL_KEYWORDS + PROFANITY_FILTER))
+
+# Sentence boundaries used when chunking documents for search
+SENTENCE_BOUNDARY = re.compile(r'[.!?]')
+
 # === DATA MODELS ===
 
 class QueryRequest(BaseModel):
@@ -88,15 +102,17 @@ def moderate_content(text: str) -> tuple[bool, str]:
     """
     text_lower = text.lower()
     
-    # Check for harmful keywords
-    for keyword in HARMFUL_KEYWORDS:
-        if keyword in text_lower:
-            return False, f"Content contains inappropriate material: {keyword}"
-    
-    # Check for profanity
-    for word in PROFANITY_FILTER:
-        if word in text_lower:
-            return False, f"Content contains filtered language: {word}"
+    # One scan for any keyword; only name the offending term on a hit
+    if MODERATION_PATTERN.search(text_lower):
+        # Check for harmful keywords
+        for keyword in HARMFUL_KEYWORDS:
+            if keyword in text_lower:
+                return False, f"Content contains inappropriate material: {keyword}"
+        
+        # Check for profanity
+        for word in PROFANITY_FILTER:
+            if word in text_lower:
+                return False, f"Content contains filtered language: {word}"
     
     # Additional safety checks
     if len(text) > 2000:
@@ -107,6 +123,42 @@ def moderate_content(text: str) -> tuple[bool, str]:
     
     return True, "Content is safe"
 
+def build_text_chunks(text: str, raw_text: str) -> list:
+    """
+    Split a document into overlapping search chunks.
+    
+    Called once at upload so queries reuse the chunks instead of
+    re-splitting every document on every request.
+    
+    Args:
+        text: Whitespace-normalized document text
+        raw_text: Original extracted text with line breaks
+    
+    Returns:
+        list: Text chunks from all chunking strategies
+    """
+    # Multiple text chunking strategies for better matching
+    text_chunks = []
+    
+    # Strategy 1: Split by sentences (periods, exclamation, question marks)
+    sentences = [s.strip() for s in SENTENCE_BOUNDARY.split(text) if len(s.strip()) > 20]
+    text_chunks.extend(sentences)
+    
+    # Strategy 2: Split by paragraphs (double newlines in raw text)
+    paragraphs = [p.strip() for p in raw_text.split('\n\n') if len(p.strip()) > 50]
+    text_chunks.extend(paragraphs)
+    
+    # Strategy 3: Fixed-size chunks for very long documents
+    words = text.split()
+    if len(words) > 100:
+        chunk_size = 50
+        for i in range(0, len(words), chunk_size):
+            chunk = ' '.join(words[i:i+chunk_size*2])  # Overlapping chunks
+            if len(chunk) > 100:
+                text_chunks.append(chunk)
+    
+    return text_chunks
+
 def get_conversation_context(session_id: str, max_history: int = 3) -> str:
     """
     Get conversation context for follow-up questions.
@@ -121,16 +173,16 @@ def get_conversation_context(session_id: str, max_history: int = 3) -> str:
     if session_id not in conversation_history:
         return ""
     
-    history = conversation_history[session_id][-max_history:]
-    context = ""
-    
-    for i, exchange in enumerate(history):
-        context += f"Previous Q{i+1}: {exchange['question']}\n"
-        context += f"Previous A{i+1}: {exchange['answer'][:200]}...\n\n"
+    history = conversation_history[session_id]
+    recent = islice(history, max(0, len(history) - max_history), None)
     
-    return context
+    return "".join(
+        f"Previous Q{i}: {exchange['question']}\n"
+        f"Previous A{i}: {exchange['answer'][:200]}...\n\n"
+        for i, exchange in enumerate(recent, 1)
+    )
 
-def store_conversation(session_id: str, question: str, answer: str, source: str):
+def store_conversation(session_id: str, question: str, answer: str, source: str, timestamp: Optional[str] = None):
     """
     Store conversation exchange in memory.
     
@@ -139,20 +191,18 @@ def store_conversation(session_id: str, question: str, answer: str, source: str)
         question: User's question
         answer: System's answer
         source: Source of the answer
+        timestamp: ISO timestamp of the exchange (defaults to now)
     """
+    # Bounded deque evicts the oldest exchange automatically
     if session_id not in conversation_history:
-        conversation_history[session_id] = []
+        conversation_history[session_id] = deque(maxlen=MAX_EXCHANGES_PER_SESSION)
     
     conversation_history[session_id].append({
         "question": question,
         "answer": answer,
         "source": source,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp or datetime.now().isoformat()
     })
-    
-    # Keep only last 10 exchanges per session
-    if len(conversation_history[session_id]) > 10:
-        conversation_history[session_id] = conversation_history[session_id][-10:]
 
 # === API ENDPOINTS ===
 
@@ -218,7 +268,7 @@ async def debug_conversations():
             "session_id": session_id,
             "exchange_count": len(history),
             "last_activity": history[-1]["timestamp"] if history else None,
-            "recent_questions": [h["question"][:100] for h in history[-3:]]  # Last 3 questions
+            "recent_questions": [h["question"][:100] for h in list(history)[-3:]]  # Last 3 questions
         })
     
     return {
@@ -240,50 +290,59 @@ async def upload(file: UploadFile = File(...)):
         
     Process:
         1. Validates file is PDF
-        2. Extracts text from all pages
-        3. Generates unique document ID
-        4. Stores in memory for searching
+        2. Generates unique document ID from the file content
+        3. Reuses the stored document if the same content was already uploaded
+        4. Extracts text from all pages
+        5. Stores in memory for searching
     """
     try:
         # Validate file type
         if not file.filename.endswith('.pdf'):
             return {"success": False, "error": "Only PDF files supported"}
         
-        # Process PDF document
+        # Read upload and derive its content-addressed ID
         content = await file.read()
-        pdf_reader = PdfReader(io.BytesIO(content))
-        
-        # Extract and clean text from all pages
-        raw_text = ""
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                # Clean up text formatting
-                page_text = page_text.replace('\n\n', '\n').replace('\t', ' ')
-                raw_text += page_text + "\n"
-        
-        # Clean and normalize text
-        text = ' '.join(raw_text.split())  # Remove extra whitespace
-        
-        # Generate unique document ID
         doc_id = hashlib.md5(content).hexdigest()[:8]
         
-        # Store document with metadata
-        documents[doc_id] = {
-            "filename": file.filename,
-            "text": text,
-            "raw_text": raw_text,  # Keep original formatting for context
-            "pages": len(pdf_reader.pages),
-            "word_count": len(text.split()),
-            "uploaded_at": datetime.now().isoformat()
-        }
+        doc = documents.get(doc_id)
+        if doc is not None:
+            # Identical content was already processed - skip re-parsing the PDF
+            doc["filename"] = file.filename
+            doc["uploaded_at"] = datetime.now().isoformat()
+        else:
+            # Process PDF document
+            pdf_reader = PdfReader(io.BytesIO(content))
+            
+            # Extract and clean text from all pages
+            raw_text = ""
+            for page in pdf_reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    # Clean up text formatting
+                    page_text = page_text.replace('\n\n', '\n').replace('\t', ' ')
+                    raw_text += page_text + "\n"
+            
+            # Clean and normalize text
+            text = ' '.join(raw_text.split())  # Remove extra whitespace
+            
+            # Store document with metadata
+            doc = {
+                "filename": file.filename,
+                "text": text,
+                "raw_text": raw_text,  # Keep original formatting for context
+                "chunks": build_text_chunks(text, raw_text),  # Precomputed search chunks
+                "pages": len(pdf_reader.pages),
+                "word_count": len(text.split()),
+                "uploaded_at": datetime.now().isoformat()
+            }
+            documents[doc_id] = doc
         
         return {
             "success": True,
-            "message": f"Uploaded {file.filename} ({len(pdf_reader.pages)} pages)",
+            "message": f"Uploaded {file.filename} ({doc['pages']} pages)",
             "document_id": doc_id,
-            "pages_processed": len(pdf_reader.pages),
-            "word_count": len(text.split())
+            "pages_processed": doc["pages"],
+            "word_count": doc["word_count"]
         }
         
     except Exception as e:
@@ -317,6 +376,9 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
         if not q:
             return {"success": False, "error": "No question provided"}
         
+        # Single timestamp shared by the response and the stored exchange
+        timestamp = datetime.now().isoformat()
+        
         # STEP 0: Content moderation
         is_safe, moderation_reason = moderate_content(q)
         if not is_safe:
@@ -324,77 +386,57 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
                 "success": False, 
                 "error": f"Content moderation: {moderation_reason}",
                 "moderated": True,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
         
         # Get conversation context for follow-up questions
         context = get_conversation_context(sid)
         enhanced_query = f"{context}Current question: {q}" if context else q
         
-        print(f"DEBUG: Session {sid} - Enhanced query with context: {len(context)} chars context")  # Debug log
+        logger.debug("Session %s - Enhanced query with context: %d chars context", sid, len(context))
         
         # STEP 1: Search uploaded documents with robust matching
         best_match = None
         best_score = 0
+        chunks_scanned = 0
+        
+        logger.debug("Searching %d documents for: '%s'", len(documents), q)
         
-        print(f"DEBUG: Searching {len(documents)} documents for: '{q}'")  # Debug log
+        # Enhanced text processing - more inclusive word filtering
+        # Query-only terms are computed once, outside the document/chunk loops
+        question_words = [word.lower().strip('.,!?;:"()[]') for word in q.split() if len(word) > 1]  # Changed from >2 to >1
+        total_words = len(question_words)
+        
+        # Stems for partial matching (only for longer words, last character removed)
+        stemmed_words = [(word, word[:-1]) for word in question_words if len(word) > 3]
+        
+        # Full phrase for the phrase matching bonus
+        question_phrase = ' '.join(question_words) if total_words >= 2 else None
         
         for doc_id, doc in documents.items():
-            print(f"DEBUG: Checking document {doc['filename']} with {doc['word_count']} words")  # Debug log
-            
-            # Enhanced text processing - more inclusive word filtering
-            doc_text = doc["text"].lower()
-            question_words = [word.lower().strip('.,!?;:"()[]') for word in q.split() if len(word) > 1]  # Changed from >2 to >1
-            
-            print(f"DEBUG: Question words: {question_words}")  # Debug log
-            
-            # Multiple text chunking strategies for better matching
-            text_chunks = []
+            # Search chunks were built once at upload time
+            text_chunks = doc["chunks"]
             
-            # Strategy 1: Split by sentences (periods, exclamation, question marks)
-            sentences = [s.strip() for s in doc["text"].replace('\n', ' ').replace('!', '.').replace('?', '.').split('.') if len(s.strip()) > 20]
-            text_chunks.extend(sentences)
-            
-            # Strategy 2: Split by paragraphs (double newlines in raw text)
-            paragraphs = [p.strip() for p in doc["raw_text"].split('\n\n') if len(p.strip()) > 50]
-            text_chunks.extend(paragraphs)
-            
-            # Strategy 3: Fixed-size chunks for very long documents
-            words = doc["text"].split()
-            if len(words) > 100:
-                chunk_size = 50
-                for i in range(0, len(words), chunk_size):
-                    chunk = ' '.join(words[i:i+chunk_size*2])  # Overlapping chunks
-                    if len(chunk) > 100:
-                        text_chunks.append(chunk)
-            
-            print(f"DEBUG: Generated {len(text_chunks)} text chunks")  # Debug log
+            chunks_scanned += len(text_chunks)
             
             # Search through all text chunks
             for chunk in text_chunks:
                 chunk_lower = chunk.lower()
                 
                 # Multiple matching strategies
-                matches = 0
-                total_words = len(question_words)
-                
                 # Exact word matches
                 exact_matches = sum(1 for word in question_words if word in chunk_lower)
                 
                 # Partial word matches (for stemming-like effects)
                 partial_matches = 0
-                for word in question_words:
-                    if len(word) > 3:  # Only for longer words
-                        word_stem = word[:len(word)-1]  # Remove last character
-                        if word_stem in chunk_lower and word not in chunk_lower:
-                            partial_matches += 0.5
+                for word, word_stem in stemmed_words:
+                    if word_stem in chunk_lower and word not in chunk_lower:
+                        partial_matches += 0.5
                 
                 # Phrase matching bonus
                 phrase_bonus = 0
-                if len(question_words) >= 2:
-                    question_phrase = ' '.join(question_words)
-                    if question_phrase in chunk_lower:
-                        phrase_bonus = 0.3
+                if question_phrase is not None and question_phrase in chunk_lower:
+                    phrase_bonus = 0.3
                 
                 # Calculate total relevance score
                 total_matches = exact_matches + partial_matches + phrase_bonus
@@ -417,11 +459,12 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
                             "matches": exact_matches,
                             "relevance": relevance_score
                         }
-                        print(f"DEBUG: New best match found - Score: {relevance_score:.3f}, Matches: {exact_matches}")  # Debug log
+        
+        logger.debug("Scanned %d chunks across %d documents, best score %.3f", chunks_scanned, len(documents), best_score)
         
         # Return best document match if found
         if best_match:
-            print(f"DEBUG: Returning document match with confidence {best_match['confidence']:.3f}")  # Debug log
+            logger.debug("Returning document match with confidence %.3f", best_match['confidence'])
             
             response = {
                 "success": True,
@@ -433,15 +476,15 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
                 "relevance_score": best_match["relevance"],
                 "session_id": sid,
                 "has_context": bool(context),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
             # Store conversation for follow-up questions
-            store_conversation(sid, q, best_match["answer"], "uploaded_document")
+            store_conversation(sid, q, best_match["answer"], "uploaded_document", timestamp)
             
             return response
         
-        print(f"DEBUG: No document matches found, trying web search...")  # Debug log
+        logger.debug("No document matches found, trying web search...")
         
         # STEP 2: Fallback to web search using DuckDuckGo
         try:
@@ -457,11 +500,11 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
                     "confidence": 0.7,
                     "session_id": sid,
                     "has_context": bool(context),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 }
                 
                 # Store conversation for follow-up questions
-                store_conversation(sid, q, data["Abstract"], "web_search")
+                store_conversation(sid, q, data["Abstract"], "web_search", timestamp)
                 
                 return response
         except Exception:
@@ -477,11 +520,11 @@ async def query(request: Optional[QueryRequest] = None, question: str = Form(Non
             "confidence": 0.3,
             "session_id": sid,
             "has_context": bool(context),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
         
         # Store conversation for follow-up questions
-        store_conversation(sid, q, fallback_answer, "fallback")
+        store_conversation(sid, q, fallback_answer, "fallback", timestamp)
         
         return response
         
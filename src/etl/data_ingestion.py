@@ -3,6 +3,7 @@ Data ingestion module for Enterprise Production Assistant
 Handles PDF processing and text extraction for the knowledge base
 """
 
+import io
 import os
 import hashlib
 from typing import List, Dict, Any
@@ -18,62 +19,83 @@ class DataIngestion:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.processed_docs = {}
+        # Running totals, kept in sync by ingest_pdf
+        self._total_pages = 0
+        self._total_chunks = 0
     
     def ingest_pdf(self, file_path: str) -> Dict[str, Any]:
         """Ingest a single PDF file"""
         try:
             with open(file_path, 'rb') as file:
                 content = file.read()
-                
-            pdf_reader = PdfReader(file_path)
-            text_chunks = []
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                text = page.extract_text()
-                if text.strip():
-                    chunks = self._chunk_text(text, chunk_size=500)
-                    for chunk_id, chunk in enumerate(chunks):
-                        text_chunks.append({
-                            'content': chunk,
-                            'page': page_num + 1,
-                            'chunk_id': chunk_id,
-                            'source': os.path.basename(file_path)
-                        })
             
             doc_id = hashlib.md5(content).hexdigest()[:12]
+            filename = os.path.basename(file_path)
+            cached = self.processed_docs.get(doc_id)
+            if cached is not None:
+                # Same content was already ingested - reuse its chunks instead of re-parsing
+                logger.debug("Reusing chunks of %s for %s", doc_id, file_path)
+                text_chunks = [dict(chunk, source=filename) for chunk in cached['chunks']]
+                total_pages = cached['total_pages']
+            else:
+                pdf_reader = PdfReader(io.BytesIO(content))
+                text_chunks = []
+                
+                for page_num, page in enumerate(pdf_reader.pages):
+                    text = page.extract_text()
+                    if text.strip():
+                        chunks = self._chunk_text(text, chunk_size=500)
+                        for chunk_id, chunk in enumerate(chunks):
+                            text_chunks.append({
+                                'content': chunk,
+                                'page': page_num + 1,
+                                'chunk_id': chunk_id,
+                                'source': filename
+                            })
+                total_pages = len(pdf_reader.pages)
             
             doc_info = {
                 'doc_id': doc_id,
-                'filename': os.path.basename(file_path),
-                'total_pages': len(pdf_reader.pages),
+                'filename': filename,
+                'total_pages': total_pages,
                 'total_chunks': len(text_chunks),
                 'chunks': text_chunks
             }
             
             self.processed_docs[doc_id] = doc_info
-            logger.info(f"Ingested {file_path}: {len(text_chunks)} chunks from {len(pdf_reader.pages)} pages")
+            if cached is None:
+                self._total_pages += doc_info['total_pages']
+                self._total_chunks += doc_info['total_chunks']
+                logger.debug("Ingested %s: %d chunks from %d pages", file_path, len(text_chunks), total_pages)
             
             return doc_info
             
         except Exception as e:
-            logger.error(f"Failed to ingest {file_path}: {str(e)}")
+            logger.error("Failed to ingest %s: %s", file_path, e)
             raise
     
     def ingest_directory(self, directory: str) -> List[Dict[str, Any]]:
         """Ingest all PDF files from a directory"""
         results = []
-        pdf_files = list(Path(directory).glob("*.pdf"))
+        try:
+            with os.scandir(directory) as entries:
+                pdf_files = [entry.path for entry in entries
+                             if entry.name.endswith('.pdf') and entry.is_file()]
+        except FileNotFoundError:
+            pdf_files = []
         
-        logger.info(f"Found {len(pdf_files)} PDF files in {directory}")
+        logger.info("Found %d PDF files in %s", len(pdf_files), directory)
         
         for pdf_file in pdf_files:
             try:
-                result = self.ingest_pdf(str(pdf_file))
+                result = self.ingest_pdf(pdf_file)
                 results.append(result)
             except Exception as e:
-                logger.error(f"Skipping {pdf_file}: {str(e)}")
+                logger.error("Skipping %s: %s", pdf_file, e)
                 continue
         
+        logger.info("Ingested %d of %d PDF files from %s", len(results), len(pdf_files), directory)
+        
         return results
     
     def _chunk_text(self, text: str, chunk_size: int = 500) -> List[str]:
@@ -97,13 +119,9 @@ class DataIngestion:
     
     def get_document_stats(self) -> Dict[str, Any]:
         """Get statistics about processed documents"""
-        total_docs = len(self.processed_docs)
-        total_chunks = sum(doc['total_chunks'] for doc in self.processed_docs.values())
-        total_pages = sum(doc['total_pages'] for doc in self.processed_docs.values())
-        
         return {
-            'total_documents': total_docs,
-            'total_pages': total_pages,
-            'total_chunks': total_chunks,
+            'total_documents': len(self.processed_docs),
+            'total_pages': self._total_pages,
+            'total_chunks': self._total_chunks,
             'documents': list(self.processed_docs.keys())
         }
\ No newline at end of file
@@ -10,7 +10,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """Document class for retrieval results"""
     page_content: str
@@ -22,13 +22,20 @@ class DocumentRetriever:
     def __init__(self):
         self.documents = {}
         self.embeddings = None  # Would integrate with vector DB in production
+        self._total_chunks = 0  # Running total, kept in sync by add_documents
     
     def add_documents(self, documents: List[Dict[str, Any]]):
         """Add processed documents to the retriever"""
         for doc in documents:
             doc_id = doc.get('doc_id')
+            previous = self.documents.get(doc_id)
+            if previous is not None:
+                self._total_chunks -= previous.get('total_chunks', 0)
             self.documents[doc_id] = doc
-            logger.info(f"Added document {doc_id} with {doc.get('total_chunks', 0)} chunks")
+            self._total_chunks += doc.get('total_chunks', 0)
+            logger.debug("Added document %s with %d chunks", doc_id, doc.get('total_chunks', 0))
+        
+        logger.info("Added %d documents to the retriever", len(documents))
     
     def semantic_search(self, query: str, top_k: int = 5) -> List[Document]:
         """Perform semantic search (simplified keyword matching for now)"""
@@ -83,11 +90,8 @@ class DocumentRetriever:
     
     def get_document_stats(self) -> Dict[str, Any]:
         """Get retriever statistics"""
-        total_docs = len(self.documents)
-        total_chunks = sum(doc.get('total_chunks', 0) for doc in self.documents.values())
-        
         return {
-            'document_count': total_docs,
-            'total_chunks': total_chunks,
+            'document_count': len(self.documents),
+            'total_chunks': self._total_chunks,
             'collection_name': 'semantic_data'
         }
\ No newline at end of file
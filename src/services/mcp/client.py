@@ -4,6 +4,7 @@ Orchestrates document retrieval and web search with intelligent fallback
 """
 
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -50,12 +51,12 @@ class MCPClient:
                 os.unlink(temp_path)
                 
         except Exception as e:
-            logger.error(f"Document processing failed: {str(e)}")
+            logger.error("Document processing failed: %s", e)
             return {'success': False, 'error': str(e)}
     
     def query(self, question: str) -> Dict[str, Any]:
         """Process a query with document search and web fallback"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
             # Step 1: Search documents
@@ -70,7 +71,7 @@ class MCPClient:
                     'source': 'document',
                     'confidence': best_match.metadata.get('score', 0),
                     'filename': best_match.metadata.get('source', ''),
-                    'processing_time': (datetime.now() - start_time).total_seconds(),
+                    'processing_time': time.perf_counter() - start_time,
                     'metadata': {
                         'doc_id': best_match.metadata.get('doc_id'),
                         'page': best_match.metadata.get('page'),
@@ -94,7 +95,7 @@ class MCPClient:
                         'answer': data["Abstract"],
                         'source': 'web',
                         'confidence': 0.75,
-                        'processing_time': (datetime.now() - start_time).total_seconds(),
+                        'processing_time': time.perf_counter() - start_time,
                         'metadata': {'search_method': 'duckduckgo'}
                     }
             except:
@@ -107,16 +108,16 @@ class MCPClient:
                 'answer': 'No relevant information found. Try uploading a document or rephrasing your question.',
                 'source': 'none',
                 'confidence': 0.0,
-                'processing_time': (datetime.now() - start_time).total_seconds()
+                'processing_time': time.perf_counter() - start_time
             }
             
         except Exception as e:
-            logger.error(f"Query processing failed: {str(e)}")
+            logger.error("Query processing failed: %s", e)
             return {
                 'success': False,
                 'question': question,
                 'error': str(e),
-                'processing_time': (datetime.now() - start_time).total_seconds()
+                'processing_time': time.perf_counter() - start_time
             }
     
     def get_system_status(self) -> Dict[str, Any]: